@@ -1,5 +1,7 @@
 import json
 import os
+from functools import lru_cache
+
 from cromwell_tools.cromwell_auth import CromwellAuth
 
 # Global variables for the report status
@@ -11,6 +13,9 @@ MAX_DELAY: int = (
     5
 )  # we consider if docRootFile is older than 5 mins then the Thread is Frozen
 
+# The sleep intervals in seconds that get_settings coerces to int, with their defaults if missing from the config
+_INTERVAL_DEFAULTS = (("queue_update_interval", 1), ("workflow_start_interval", 1))
+
 
 def get_settings(config_path):
     """This function loads the config.json file based on the path and return the assembled settings dictionary.
@@ -29,9 +34,18 @@ def get_settings(config_path):
                 workflows from Cromwell.
             workflow_start_interval (int): The sleep time between each time the igniter starts a workflow in Cromwell.
             cromwell_query_dict (dict): The query used for retrieving cromwell workflows
+
+        The returned dictionary is a shallow copy of the cached config, callers may add or replace its keys and may
+        mutate `cromwell_query_dict`, but must not mutate any other nested value, which is shared with the cache.
     """
-    with open(config_path, "r") as f:
-        settings = json.load(f)
+    # `abspath` is a cheap, purely lexical normalization, so `./config.json` and `config.json` share a cache entry
+    config_path = os.path.abspath(config_path)
+    config_stat = os.stat(config_path)
+    # A shallow copy is enough here, `cromwell_query_dict` is the only nested value that gets mutated and it is copied
+    # below before being updated
+    settings = dict(
+        _load_config(config_path, config_stat.st_mtime_ns, config_stat.st_size)
+    )
 
     # Check Cromwell url
     if not settings["cromwell_url"]:
@@ -53,13 +67,11 @@ def get_settings(config_path):
             settings["caas_key"] = caas_key
 
     # Check other config parameters
-    settings["queue_update_interval"] = int(settings.get("queue_update_interval", 1))
-    settings["workflow_start_interval"] = int(
-        settings.get("workflow_start_interval", 1)
-    )
+    for interval_key, default_interval in _INTERVAL_DEFAULTS:
+        settings[interval_key] = int(settings.get(interval_key, default_interval))
 
     # Check cromwell query parameters
-    query_dict = settings.get("cromwell_query_dict", {})
+    query_dict = dict(settings.get("cromwell_query_dict", {}))
     if ("status", "On Hold") not in query_dict.items():
         query_dict.update({"status": "On Hold"})
     settings["cromwell_query_dict"] = query_dict
@@ -67,6 +79,24 @@ def get_settings(config_path):
     return settings
 
 
+@lru_cache(maxsize=8)
+def _load_config(config_path, mtime_ns, size):
+    """Parse the config.json file, the result is cached so each file is only read again when it gets modified.
+
+    Args:
+        config_path (str): Absolute path to the config.json file.
+        mtime_ns (int): The modification time of the config file, part of the cache key so that an edited file is
+            parsed again instead of being served from the cache.
+        size (int): The size of the config file, also part of the cache key, catches edits that happen within the
+            timestamp resolution of the file system.
+
+    Returns:
+        dict: The raw content of the config file. Callers must not mutate it.
+    """
+    with open(config_path, "rb") as f:
+        return json.loads(f.read())
+
+
 def get_cromwell_auth(settings):
     cromwell_url = settings.get("cromwell_url")
     if settings.get("use_caas"):
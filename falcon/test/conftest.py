@@ -0,0 +1,13 @@
+import logging
+
+import pytest
+
+
+@pytest.fixture
+def capture_all_logs(request, caplog):
+    """
+    Capture log records of every level from the logger named by the `captured_logger` attribute of the test class,
+    instead of setting the level per test. Only that logger is lowered to DEBUG, so other libraries keep their own
+    levels.
+    """
+    caplog.set_level(logging.DEBUG, logger=request.cls.captured_logger)
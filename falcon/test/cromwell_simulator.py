@@ -6,12 +6,25 @@ from uuid import uuid4
 import requests
 from requests.models import Response
 
+# A fixed pool of succeeded workflow metadata blocks, `query_workflows_succeed` samples from it instead of
+# building every block from scratch on each call
+_SUCCEEDED_WORKFLOW_POOL = [
+    {
+        'id': str(uuid4()),
+        'status': 'Succeeded',
+        'submission': '2018-05-25T19:03:51.736Z',
+    }
+    for _ in range(10)
+]
+
+_system_random = random.SystemRandom()
+
 
-def query_workflows_raises_ConnectionError(query_dict, auth):
+def query_workflows_raises_ConnectionError(query_dict, auth, raise_for_status=False):
     raise requests.exceptions.ConnectionError
 
 
-def query_workflows_raises_RequestException(query_dict, auth):
+def query_workflows_raises_RequestException(query_dict, auth, raise_for_status=False):
     raise requests.exceptions.RequestException
 
 
@@ -27,14 +40,9 @@ def query_workflows_succeed(query_dict, auth, raise_for_status=False):
     response = Mock(spec=Response)
     response.status_code = 200
     response.json.return_value = {
-        'results': [
-            {
-                'id': str(uuid4()),
-                'status': 'Succeeded',
-                'submission': '2018-05-25T19:03:51.736Z',
-            }
-            for i in range(random.randint(1, 10))
-        ]
+        'results': random.sample(
+            _SUCCEEDED_WORKFLOW_POOL, k=random.randint(1, len(_SUCCEEDED_WORKFLOW_POOL))
+        )
     }
     return response
 
@@ -111,7 +119,7 @@ def query_workflows_returns_workflows_with_different_bundle_versions(
     return response
 
 
-def query_workflows_fail_with_400(query_dict, auth):
+def query_workflows_fail_with_400(query_dict, auth, raise_for_status=False):
     response = Mock(spec=Response)
     response.status_code = 400
     response.json.return_value = {
@@ -122,7 +130,7 @@ def query_workflows_fail_with_400(query_dict, auth):
     return response
 
 
-def query_workflows_fail_with_500(query_dict, auth):
+def query_workflows_fail_with_500(query_dict, auth, raise_for_status=False):
     response = Mock(spec=Response)
     response.status_code = 500
     response.text = 'An error message for Internal Server Error.'
@@ -134,17 +142,15 @@ def query(*args, **kwargs):
     Note: This function monkey-patches the `cromwell-tools.query()` for simulation purposes, DO NOT use this
     function is unit tests.
     """
-    system_random = random.SystemRandom()
-    candidate_func_list = [query_workflows_succeed for i in range(20)]
-    candidate_func_list.append(query_workflows_fail_with_400)
-    candidate_func_list.append(query_workflows_fail_with_500)
-    candidate_func_list.append(query_workflows_raises_ConnectionError)
-    candidate_func_list.append(query_workflows_raises_RequestException)
-
     # Make the possibilities of getting the status codes 200:400:500 as 20:1:1 in the simulation
     # There are also 1/12 probabilities the simulator will intentionally throw out some connection issues
-    query_func = system_random.choice(candidate_func_list)
-    return query_func(*args, **kwargs)
+    candidate_func_list = [query_workflows_succeed] * 20 + [
+        query_workflows_fail_with_400,
+        query_workflows_fail_with_500,
+        query_workflows_raises_ConnectionError,
+        query_workflows_raises_RequestException,
+    ]
+    return _call_random_candidate(candidate_func_list, *args, **kwargs)
 
 
 def release_workflow_succeed(uuid, auth):
@@ -204,16 +210,19 @@ def release_hold(*args, **kwargs):
     Note: This function monkey-patches the `cromwell-tools.release_hold()` for simulation purposes, DO NOT use this
     function is unit tests.
     """
-    system_random = random.SystemRandom()
-    candidate_func_list = [release_workflow_succeed for i in range(20)]
-    candidate_func_list.append(release_workflow_with_400)
-    candidate_func_list.append(release_workflow_with_403)
-    candidate_func_list.append(release_workflow_with_404)
-    candidate_func_list.append(release_workflow_with_500)
-    candidate_func_list.append(release_workflow_raises_ConnectionError)
-    candidate_func_list.append(release_workflow_raises_RequestException)
-
     # Make the possibilities of getting the status codes 200:400:403:404:500 as 20:1:1:1:1 in the simulation
     # There are also 1/13 probabilities the simulator will intentionally throw out some connection issues
-    release_func = system_random.choice(candidate_func_list)
-    return release_func(*args, **kwargs)
+    candidate_func_list = [release_workflow_succeed] * 20 + [
+        release_workflow_with_400,
+        release_workflow_with_403,
+        release_workflow_with_404,
+        release_workflow_with_500,
+        release_workflow_raises_ConnectionError,
+        release_workflow_raises_RequestException,
+    ]
+    return _call_random_candidate(candidate_func_list, *args, **kwargs)
+
+
+def _call_random_candidate(candidate_func_list, *args, **kwargs):
+    """Pick one of the simulated responses at random and forward the call to it."""
+    return _system_random.choice(candidate_func_list)(*args, **kwargs)
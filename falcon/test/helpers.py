@@ -0,0 +1,9 @@
+def has_log_record(caplog, level, text):
+    """
+    Check the captured log records for one that has the given level and contains the given text in its message. This
+    reads the structured records instead of scanning the fully formatted `caplog.text`.
+    """
+    return any(
+        record.levelno == level and text in record.getMessage()
+        for record in caplog.records
+    )
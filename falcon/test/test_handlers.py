@@ -1,44 +1,94 @@
 import logging
 import os
-import timeit
 from queue import Queue
+from types import MappingProxyType
 from unittest import mock
-from unittest.mock import patch
 
 import pytest
 
 from falcon import queue_handler
 from falcon.test import cromwell_simulator
+from falcon.test.helpers import has_log_record
+
+
+# Shared by all tests below as read-only data, the metadata blocks are wrapped in `MappingProxyType` so that a test
+# cannot mutate them by accident. The nested labels stay plain dicts, as `_assemble_workflow()` expects a dict there
+MOCK_WORKFLOW_METAS = tuple(
+    MappingProxyType(
+        {
+            'id': 'fake-id-{}'.format(i),
+            'name': 'fake-name-{}'.format(i),
+            'status': 'On Hold',
+            'submission': '2018-01-0{}T23:49:40.620Z'.format(i),
+            'labels': {
+                'cromwell-workflow-id': 'cromwell-fake-id-{}'.format(i),
+                'bundle-uuid': 'fake-bundle-uuid-{}'.format(i),
+                'bundle-version': '2018-01-01T22:49:40.620Z',
+                'workflow-name': 'fake-name-{}'.format(i),
+            },
+        }
+    )
+    for i in range(1, 4)
+)
+
+# The `Workflow` objects assembled from `MOCK_WORKFLOW_METAS`, `Workflow.__eq__()` compares them by id
+MOCK_WORKFLOWS = tuple(
+    queue_handler.Workflow(
+        workflow_id=meta['id'],
+        bundle_uuid=meta['labels']['bundle-uuid'],
+        bundle_version=meta['labels']['bundle-version'],
+        labels=meta['labels'],
+    )
+    for meta in MOCK_WORKFLOW_METAS
+)
 
 
-@mock.create_autospec
 def mock_queue_handler_execution_loop(self):
     """
-    This function mocks the `queue_handler.execution_loop()` instance method, it doesn't have any functionality.
-    The motivation of mocking this is to avoid executing the actual while loop in `queue_handler.execution_loop()`
-    during the unittest.
+    This function mocks the `queue_handler.execution_loop()` instance method, it doesn't have any functionality
+    except recording the handler it was called with in `mock_queue_handler_execution_loop.calls`. The motivation of
+    mocking this is to avoid executing the actual while loop in `queue_handler.execution_loop()` during the unittest.
     """
+    mock_queue_handler_execution_loop.calls.append(self)
     return True
 
 
+mock_queue_handler_execution_loop.calls = []
+
+
+@pytest.fixture(scope='class')
+def base_handler(request):
+    """
+    The `QueueHandler` shared by the tests of a class, built from the `config_path` of the class.
+    """
+    return queue_handler.QueueHandler(request.cls.config_path)
+
+
+@pytest.fixture
+def handler(base_handler):
+    """
+    Hand out the shared `QueueHandler` with its mutable state reset, so every test starts with an empty queue and no
+    thread.
+    """
+    base_handler.set_queue(base_handler.create_empty_queue(-1))
+    base_handler.thread = None
+    return base_handler
+
+
 class TestWorkflow(object):
     """
     This class hosts test cases fro testing the `queue_handler.Workflow` class
     """
 
-    def test_a_workflow_shows_its_own_id_in_logging(self, capsys):
+    def test_a_workflow_shows_its_own_id_in_logging(self):
         """
-        This function asserts the `Workflow` class implements the `__repr__()` method correctly.
-
-        `capsys` is a fixture of provided by Pytest, which captures all stdout and stderr streams during the test.
+        This function asserts the `Workflow` class implements the `__repr__()` and `__str__()` methods correctly.
         """
         test_workflow = queue_handler.Workflow(
             workflow_id='fake-workflow-1', bundle_uuid='fake-bundle-uuid-1'
         )
-        print(test_workflow)
-
-        captured_stdout, _ = capsys.readouterr()
-        assert captured_stdout == 'fake-workflow-1\n'
+        assert repr(test_workflow) == 'fake-workflow-1'
+        assert str(test_workflow) == 'fake-workflow-1'
 
     def test_a_workflow_is_distinguishable_from_another_one(self):
         """
@@ -59,6 +109,7 @@ class TestWorkflow(object):
         assert test_workflow1 != test_workflow2
 
 
+@pytest.mark.usefixtures('capture_all_logs')
 class TestQueueHandler(object):
     """
     This class hosts all unittest cases for testing the `queue_handler.QueueHandler` and its methods. This class takes
@@ -66,55 +117,17 @@ class TestQueueHandler(object):
 
     `caplog` is a fixture of provided by Pytest, which captures all logging streams during the test.
 
-    `capsys` is a fixture of provided by Pytest, which captures all stdout and stderr streams during the test.
-
     `@pytest.mark.timeout()` limits the maximum running time for test cases.
 
-    `@patch`s in the class monkey patches the functions that need to talk to an external resource, so that
-    we can test the igniter without actually talking to the external resource, in this case, the Cromwell API.
+    `monkeypatch` is a fixture provided by Pytest, it swaps out the functions that need to talk to an external
+    resource, so that we can test the handler without actually talking to the external resource, in this case, the
+    Cromwell API.
     """
 
-    data_dir = '{}/data/'.format(os.path.split(__file__)[0])
+    data_dir = os.path.join(os.path.dirname(__file__), 'data')
     cromwell_config = 'example_config_cromwell_instance.json'
-    config_path = '{0}{1}'.format(data_dir, cromwell_config)
-    mock_workflow_metas = [
-        {
-            'id': 'fake-id-1',
-            'name': 'fake-name-1',
-            'status': 'On Hold',
-            'submission': '2018-01-01T23:49:40.620Z',
-            'labels': {
-                'cromwell-workflow-id': 'cromwell-fake-id-1',
-                'bundle-uuid': 'fake-bundle-uuid-1',
-                'bundle-version': '2018-01-01T22:49:40.620Z',
-                'workflow-name': 'fake-name-1',
-            },
-        },
-        {
-            'id': 'fake-id-2',
-            'name': 'fake-name-2',
-            'status': 'On Hold',
-            'submission': '2018-01-02T23:49:40.620Z',
-            'labels': {
-                'cromwell-workflow-id': 'cromwell-fake-id-2',
-                'bundle-uuid': 'fake-bundle-uuid-2',
-                'bundle-version': '2018-01-01T22:49:40.620Z',
-                'workflow-name': 'fake-name-2',
-            },
-        },
-        {
-            'id': 'fake-id-3',
-            'name': 'fake-name-3',
-            'status': 'On Hold',
-            'submission': '2018-01-03T23:49:40.620Z',
-            'labels': {
-                'cromwell-workflow-id': 'cromwell-fake-id-3',
-                'bundle-uuid': 'fake-bundle-uuid-3',
-                'bundle-version': '2018-01-01T22:49:40.620Z',
-                'workflow-name': 'fake-name-3',
-            },
-        },
-    ]
+    config_path = os.path.join(data_dir, cromwell_config)
+    captured_logger = queue_handler.logger.name
 
     def test_create_empty_queue_returns_a_valid_empty_queue_object(self):
         """
@@ -125,327 +138,193 @@ class TestQueueHandler(object):
         assert isinstance(q, Queue)
         assert q.empty() is True
 
-    @patch.object(
-        queue_handler.QueueHandler,
-        'execution_loop',
-        new=mock_queue_handler_execution_loop,
-    )
-    def test_queue_handler_can_spawn_and_start_properly(self):
+    def test_queue_handler_can_spawn_and_start_properly(self, handler, monkeypatch):
         """
         This function asserts the `queue_handler.spawn_and_start()` can be executed properly.
         """
-        test_handler = queue_handler.QueueHandler(self.config_path)
-        try:
-            test_handler.spawn_and_start()
-            mock_queue_handler_execution_loop.assert_called_once_with(test_handler)
-        finally:
-            test_handler.thread.join()
+        monkeypatch.setattr(
+            queue_handler.QueueHandler,
+            'execution_loop',
+            mock_queue_handler_execution_loop,
+        )
+        mock_queue_handler_execution_loop.calls.clear()
+        handler.spawn_and_start()
+        handler.thread.join(timeout=1)
 
-    @pytest.mark.timeout(2)
-    def test_sleep_for_can_pause_for_at_least_given_duration(self):
+        assert not handler.thread.is_alive()
+        assert mock_queue_handler_execution_loop.calls == [handler]
+
+    def test_sleep_for_pauses_the_thread_for_the_given_duration(
+        self, handler, monkeypatch
+    ):
         """
-        This function asserts the `queue_handler.sleep_for()` pauses the thread for at least a given duration.
+        This function asserts the `queue_handler.sleep_for()` pauses the thread for a given duration. `time.sleep()`
+        is replaced by a mock, so the test checks the duration passed to it instead of actually sleeping.
         """
-        test_handler = queue_handler.QueueHandler(self.config_path)
+        mock_sleep = mock.Mock()
+        monkeypatch.setattr(queue_handler.time, 'sleep', mock_sleep)
         test_sleep_time = 1
 
-        start = timeit.default_timer()
-        test_handler.sleep_for(test_sleep_time)
-        stop = timeit.default_timer()
-        elapsed = stop - start
+        handler.sleep_for(test_sleep_time)
 
-        assert test_sleep_time <= elapsed <= test_sleep_time * 1.5
+        mock_sleep.assert_called_once_with(test_sleep_time)
 
-    def test_queue_handler_join_can_handle_exception(self, caplog):
+    def test_queue_handler_join_can_handle_exception(self, handler, caplog):
         """
         This function asserts the `queue_handler.join()` handles the exception properly, meanwhile, insufficiently, this
         to some extent, tests the availability of `queue_handler.join()`, since it's just a wrapper around the
         `threading.Thread.join()`.
         """
-        caplog.set_level(logging.ERROR)
-        test_handler = queue_handler.QueueHandler(self.config_path)
-
-        assert test_handler.thread is None
-
-        test_handler.join()
-        error = caplog.text
-
-        assert 'The thread of this queue handler is not in a running state.' in error
-
-    def test_is_workflow_list_in_oldest_first_order_function_returns_true_on_oldest_first_workflow_list(
-        self
-    ):
-        """
-        This function asserts the static method `is_workflow_list_in_oldest_first_order()` returns `True` if the
-        input list of workflows are sorted in oldest-first order on the `submission` field.
-        """
-        oldest_first_workflow_list = [
-            {
-                'id': 'fake-id-1',
-                'name': 'fake-name-1',
-                'status': 'On Hold',
-                'submission': '2018-01-01T23:49:40.620Z',
-            },
-            {
-                'id': 'fake-id-2',
-                'name': 'fake-name-2',
-                'status': 'On Hold',
-                'submission': '2018-01-02T23:49:40.620Z',
-            },
-            {
-                'id': 'fake-id-3',
-                'name': 'fake-name-3',
-                'status': 'On Hold',
-                'submission': '2018-01-03T23:49:40.620Z',
-            },
-        ]
+        assert handler.thread is None
 
-        assert (
-            queue_handler.QueueHandler.is_workflow_list_in_oldest_first_order(
-                oldest_first_workflow_list
-            )
-            is True
+        handler.join()
+        assert has_log_record(
+            caplog,
+            logging.ERROR,
+            'The thread of this queue handler is not in a running state.',
         )
 
-    def test_is_workflow_list_in_oldest_first_order_function_returns_false_on_newest_first_workflow_list(
-        self
+    @pytest.mark.parametrize(
+        'workflow_list, expected',
+        [(MOCK_WORKFLOW_METAS, True), (MOCK_WORKFLOW_METAS[::-1], False)],
+        ids=['oldest-first', 'newest-first'],
+    )
+    def test_is_workflow_list_in_oldest_first_order_function_detects_the_order_of_workflow_list(
+        self, workflow_list, expected
     ):
         """
-        This function asserts the static method `is_workflow_list_in_oldest_first_order()` returns `False` if the
-        input list of workflows are sorted in newest-first order on the `submission` field.
+        This function asserts the static method `is_workflow_list_in_oldest_first_order()` returns `True` if the
+        input list of workflows are sorted in oldest-first order on the `submission` field, and `False` if they are
+        sorted in newest-first order.
         """
-        newest_first_workflow_list = [
-            {
-                'id': 'fake-id-1',
-                'name': 'fake-name-1',
-                'status': 'On Hold',
-                'submission': '2018-01-03T23:49:40.620Z',
-            },
-            {
-                'id': 'fake-id-2',
-                'name': 'fake-name-2',
-                'status': 'On Hold',
-                'submission': '2018-01-02T23:49:40.620Z',
-            },
-            {
-                'id': 'fake-id-3',
-                'name': 'fake-name-3',
-                'status': 'On Hold',
-                'submission': '2018-01-01T23:49:40.620Z',
-            },
-        ]
-
         assert (
             queue_handler.QueueHandler.is_workflow_list_in_oldest_first_order(
-                newest_first_workflow_list
+                workflow_list
             )
-            is False
+            is expected
         )
 
-    def test_assemble_workflow_can_work_on_workflow_metadata_properly(self):
+    def test_assemble_workflow_can_work_on_workflow_metadata_properly(self, handler):
         """
         This function asserts the `queue_handler._assemble_workflow()` properly parses an object of workflow metadata
         and assemble it as a `Workflow` instance.
         """
-        test_metadata = {
-            'id': 'fake-id-1',
-            'name': 'fake-name-1',
-            'status': 'On Hold',
-            'submission': '2018-01-01T23:49:40.620Z',
-            'labels': {
-                'cromwell-workflow-id': 'cromwell-fake-id-1',
-                'bundle-uuid': 'fake-bundle-uuid-1',
-                'bundle-version': '2018-01-01T22:49:40.620Z',
-                'workflow-name': 'fake-name-1',
-            },
-        }
-        test_handler = queue_handler.QueueHandler(self.config_path)
-        workflow = test_handler._assemble_workflow(test_metadata)
+        workflow = handler._assemble_workflow(MOCK_WORKFLOW_METAS[0])
 
         assert isinstance(workflow, queue_handler.Workflow)
         assert workflow.id == 'fake-id-1'
         assert workflow.bundle_uuid == 'fake-bundle-uuid-1'
         assert workflow.bundle_version == '2018-01-01T22:49:40.620Z'
 
-    def test_set_queue_indeed_changes_the_reference_pointer_properly(self, caplog):
+    def test_set_queue_indeed_changes_the_reference_pointer_properly(self, handler):
         """
         This function asserts the `queue_handler.set_queue()` accepts a `queue.Queue` object and points the reference
         to the queue when it gets called.
         """
-        caplog.set_level(logging.INFO)
-        test_handler = queue_handler.QueueHandler(self.config_path)
-        initial_queue_id = id(test_handler.workflow_queue)
+        initial_queue = handler.workflow_queue
 
         another_queue = Queue(-1)
-        another_queue_id = id(another_queue)
-        test_handler.set_queue(another_queue)
+        handler.set_queue(another_queue)
 
-        final_queue_id = id(test_handler.workflow_queue)
+        assert handler.workflow_queue is not initial_queue
+        assert handler.workflow_queue is another_queue
 
-        assert initial_queue_id != final_queue_id
-        assert final_queue_id == another_queue_id
-
-    @patch(
-        'falcon.queue_handler.CromwellAPI.query',
-        cromwell_simulator.query_workflows_succeed,
-        create=True,
-    )
-    def test_retrieve_workflows_returns_query_results_successfully(self, caplog):
+    def test_retrieve_workflows_returns_query_results_successfully(
+        self, handler, caplog, monkeypatch
+    ):
         """
         This function asserts the `queue_handler.retrieve_workflows()` works properly when it gets 200 OK from
         the Cromwell.
         """
-        caplog.set_level(logging.INFO)
-        test_handler = queue_handler.QueueHandler(self.config_path)
-        results = test_handler.retrieve_workflows(test_handler.cromwell_query_dict)
-
-        info = caplog.text
+        monkeypatch.setattr(
+            queue_handler.CromwellAPI,
+            'query',
+            cromwell_simulator.query_workflows_succeed,
+        )
+        results = handler.retrieve_workflows(handler.cromwell_query_dict)
 
         assert isinstance(results, list)
         num_workflows = len(results)
         assert num_workflows > 0
-        assert 'Retrieved {0} workflows from Cromwell.'.format(num_workflows) in info
-
-    @patch(
-        'falcon.queue_handler.CromwellAPI.query',
-        cromwell_simulator.query_workflows_fail_with_500,
-        create=True,
-    )
-    def test_retrieve_workflows_returns_none_for_500_response_code(self, caplog):
-        """
-        This function asserts the `queue_handler.retrieve_workflows()` works properly when it gets 500 error code from
-        the Cromwell.
-        """
-        caplog.set_level(logging.WARNING)
-        test_handler = queue_handler.QueueHandler(self.config_path)
-        results = test_handler.retrieve_workflows(test_handler.cromwell_query_dict)
-
-        warn = caplog.text
-
-        assert results is None
-        assert 'Failed to retrieve workflows from Cromwell' in warn
-
-    @patch(
-        'falcon.queue_handler.CromwellAPI.query',
-        cromwell_simulator.query_workflows_fail_with_400,
-        create=True,
-    )
-    def test_retrieve_workflows_returns_none_for_400_response_code(self, caplog):
-        """
-        This function asserts the `queue_handler.retrieve_workflows()` works properly when it gets 400 error code from
-        the Cromwell.
-        """
-        caplog.set_level(logging.WARNING)
-        test_handler = queue_handler.QueueHandler(self.config_path)
-        results = test_handler.retrieve_workflows(test_handler.cromwell_query_dict)
-
-        warn = caplog.text
-
-        assert results is None
-        assert 'Failed to retrieve workflows from Cromwell' in warn
-
-    @patch(
-        'falcon.queue_handler.CromwellAPI.query',
-        cromwell_simulator.query_workflows_raises_ConnectionError,
-        create=True,
-    )
-    def test_retrieve_workflows_returns_none_for_connection_error(self, caplog):
-        """
-        This function asserts the `queue_handler.retrieve_workflows()` works properly if it runs into connection
-        errors when talking to the Cromwell.
-        """
-        caplog.set_level(logging.ERROR)
-        test_handler = queue_handler.QueueHandler(self.config_path)
-        results = test_handler.retrieve_workflows(test_handler.cromwell_query_dict)
-
-        error = caplog.text
-
-        assert results is None
-        assert 'Failed to retrieve workflows from Cromwell' in error
+        assert has_log_record(
+            caplog,
+            logging.INFO,
+            'Retrieved {0} workflows from Cromwell.'.format(num_workflows),
+        )
 
-    @patch(
-        'falcon.queue_handler.CromwellAPI.query',
-        cromwell_simulator.query_workflows_raises_RequestException,
-        create=True,
+    @pytest.mark.parametrize(
+        'query_func, log_level',
+        [
+            (cromwell_simulator.query_workflows_fail_with_500, logging.WARNING),
+            (cromwell_simulator.query_workflows_fail_with_400, logging.WARNING),
+            (cromwell_simulator.query_workflows_raises_ConnectionError, logging.ERROR),
+            (cromwell_simulator.query_workflows_raises_RequestException, logging.ERROR),
+        ],
+        ids=['500', '400', 'connection-error', 'requests-exception'],
     )
-    def test_retrieve_workflows_returns_none_for_400_requests_exception(self, caplog):
+    def test_retrieve_workflows_returns_none_when_it_fails_to_query_cromwell(
+        self, handler, caplog, monkeypatch, query_func, log_level
+    ):
         """
-        This function asserts the `queue_handler.retrieve_workflows()` works properly if it runs into requests
-        exceptions when talking to
-        the Cromwell.
+        This function asserts the `queue_handler.retrieve_workflows()` works properly when it gets 400 or 500 error
+        codes from the Cromwell, or runs into connection errors or requests exceptions when talking to the Cromwell.
         """
-        caplog.set_level(logging.ERROR)
-        test_handler = queue_handler.QueueHandler(self.config_path)
-        results = test_handler.retrieve_workflows(test_handler.cromwell_query_dict)
-
-        error = caplog.text
+        monkeypatch.setattr(queue_handler.CromwellAPI, 'query', query_func)
+        results = handler.retrieve_workflows(handler.cromwell_query_dict)
 
         assert results is None
-        assert 'Failed to retrieve workflows from Cromwell' in error
+        assert has_log_record(
+            caplog, log_level, 'Failed to retrieve workflows from Cromwell'
+        )
 
-    def test_enqueue_can_put_a_workflow_into_the_queue(self):
+    def test_enqueue_can_put_workflows_into_the_queue_in_order(self, handler):
         """
-        This function asserts the `queue_handler.enqueue()` puts a workflow into the queue
+        This function asserts the `queue_handler.enqueue()` puts workflows into the queue in the order they are given.
+        The queue is drained with `get_nowait()`, so a missing workflow fails the test instead of blocking it.
         """
-        test_handler = queue_handler.QueueHandler(self.config_path)
-        assert test_handler.workflow_queue.empty() is True
+        assert handler.workflow_queue.empty() is True
 
-        mock_workflow = queue_handler.Workflow(
-            workflow_id='fake_workflow_id',
-            bundle_uuid='fake_bundle_uuid',
-            bundle_version='fake_bundle_version',
-        )
-        test_handler.enqueue(iter([mock_workflow]))
-        assert test_handler.workflow_queue.empty() is False
+        handler.enqueue(iter(MOCK_WORKFLOWS))
+        assert handler.workflow_queue.empty() is False
 
-        out = test_handler.workflow_queue.get()
-        assert out.id == 'fake_workflow_id'
+        out = [handler.workflow_queue.get_nowait() for _ in MOCK_WORKFLOWS]
+        assert out == list(MOCK_WORKFLOWS)
+        assert handler.workflow_queue.empty() is True
 
-    def test_prepare_workflows_returns_a_workflow_iterator_correctly(self):
+    def test_prepare_workflows_returns_a_workflow_iterator_correctly(self, handler):
         """
         This function asserts the `queue_handler.prepare_workflows()` returns an expected iterator of the list of
         `Workflow` objects.
         """
-        test_handler = queue_handler.QueueHandler(self.config_path)
-        test_iterator = test_handler.prepare_workflows(self.mock_workflow_metas)
+        test_iterator = handler.prepare_workflows(MOCK_WORKFLOW_METAS)
 
         assert isinstance(test_iterator, map)
 
-        expect_result = ['fake-id-1', 'fake-id-2', 'fake-id-3']
-        for idx, item in enumerate(test_iterator):
-            assert item.id == expect_result[idx]
+        assert list(test_iterator) == list(MOCK_WORKFLOWS)
 
     @pytest.mark.timeout(2)
-    @patch(
-        'falcon.queue_handler.CromwellAPI.query',
-        cromwell_simulator.query_workflows_fail_with_500,
-        create=True,
-    )
     def test_execution_event_goes_back_to_sleep_directly_when_it_fails_to_retrieve_workflows(
-        self, caplog
+        self, handler, caplog, monkeypatch
     ):
         """
         This function asserts when the `queue_handler.execution_event()` fails to retrieve any workflow, it will go
         back to sleep directly.
         """
-        caplog.set_level(logging.INFO)
-        test_handler = queue_handler.QueueHandler(self.config_path)
-        test_handler.queue_update_interval = 1
-
-        start = timeit.default_timer()
-        test_handler.execution_event()
-        stop = timeit.default_timer()
-        elapsed = stop - start
+        monkeypatch.setattr(
+            queue_handler.CromwellAPI,
+            'query',
+            cromwell_simulator.query_workflows_fail_with_500,
+        )
+        mock_sleep = mock.Mock()
+        monkeypatch.setattr(queue_handler.time, 'sleep', mock_sleep)
+        monkeypatch.setattr(handler, 'queue_update_interval', 1)
 
-        info = caplog.text
+        handler.execution_event()
 
-        assert 'is warmed up and running.' in info
-        assert (
-            'Cannot fetch any workflow from Cromwell, go back to sleep and wait for next attempt.'
-            in info
-        )
-        assert (
-            test_handler.queue_update_interval
-            <= elapsed
-            <= test_handler.queue_update_interval * 1.5
+        assert has_log_record(caplog, logging.INFO, 'is warmed up and running.')
+        assert has_log_record(
+            caplog,
+            logging.INFO,
+            'Cannot fetch any workflow from Cromwell, go back to sleep and wait for next attempt.',
         )
+        mock_sleep.assert_called_once_with(handler.queue_update_interval)
@@ -1,29 +1,50 @@
 import logging
 import os
-import timeit
 from requests.exceptions import ConnectionError, HTTPError
 from queue import Queue
 from unittest import mock
-from unittest.mock import patch
 
 import pytest
 
 from falcon import igniter
 from falcon import queue_handler
 from falcon.test import cromwell_simulator
+from falcon.test.helpers import has_log_record
 
 
-@mock.create_autospec
 def mock_igniter_execution_loop(self, handler):
     """
     This function mocks the `igniter.execution_loop()` instance method, it doesn't have any functionality except
-    checking the parameter `handler` has the type `queue_handler.QueueHandler`. The motivation of mocking this is
-    to avoid executing the actual `igniter.execution_loop()` during the unittest.
+    recording the igniter and the handler it was called with in `mock_igniter_execution_loop.calls`. The motivation
+    of mocking this is to avoid executing the actual `igniter.execution_loop()` during the unittest.
     """
-    assert isinstance(handler, queue_handler.QueueHandler)
+    mock_igniter_execution_loop.calls.append((self, handler))
     return True
 
 
+mock_igniter_execution_loop.calls = []
+
+
+@pytest.fixture(scope='class')
+def base_igniter(request):
+    """
+    The `Igniter` shared by the tests of a class, built from the `config_path` of the class.
+    """
+    return igniter.Igniter(request.cls.config_path)
+
+
+@pytest.fixture
+def igniter_instance(base_igniter):
+    """
+    Reset the thread of the shared `Igniter` before each test. Tests that replace a data attribute of the igniter must
+    do it through `monkeypatch`. Methods must be patched on the `Igniter` class rather than on this instance, since
+    undoing an instance-level patch leaves the old bound method behind on the shared instance.
+    """
+    base_igniter.thread = None
+    return base_igniter
+
+
+@pytest.mark.usefixtures('capture_all_logs')
 class TestIgniter(object):
     """
     This class hosts all unittest cases for testing the `igniter.Igniter` and its methods. This class takes
@@ -33,13 +54,15 @@ class TestIgniter(object):
 
     `@pytest.mark.timeout()` limits the maximum running time for test cases.
 
-    `@patch`s in the class monkey patches the functions that need to talk to an external resource, so that
-    we can test the igniter without actually talking to the external resource, in this case, the Cromwell API.
+    `monkeypatch` is a fixture provided by Pytest, it swaps out the functions that need to talk to an external
+    resource, so that we can test the igniter without actually talking to the external resource, in this case, the
+    Cromwell API.
     """
 
-    data_dir = '{}/data/'.format(os.path.split(__file__)[0])
+    data_dir = os.path.join(os.path.dirname(__file__), 'data')
     cromwell_config = 'example_config_cromwell_instance.json'
-    config_path = '{0}{1}'.format(data_dir, cromwell_config)
+    config_path = os.path.join(data_dir, cromwell_config)
+    captured_logger = igniter.logger.name
     mock_workflow = queue_handler.Workflow(
         workflow_id='fake_workflow_id',
         bundle_uuid='fake_bundle_uuid',
@@ -47,7 +70,7 @@ class TestIgniter(object):
     )
 
     def test_igniter_cannot_spawn_and_start_without_having_a_reference_to_a_queue_handler_object(
-        self
+        self, igniter_instance
     ):
         """
         This function asserts the `igniter.spawn_and_start()` can only run by accepting a valid
@@ -58,169 +81,106 @@ class TestIgniter(object):
         )()
 
         with pytest.raises(TypeError):
-            test_igniter = igniter.Igniter(self.config_path)
-            test_igniter.spawn_and_start(not_a_real_queue_handler)
+            igniter_instance.spawn_and_start(not_a_real_queue_handler)
 
     @pytest.mark.timeout(2)
-    @patch.object(igniter.Igniter, 'execution_loop', new=mock_igniter_execution_loop)
-    def test_igniter_can_spawn_and_start_properly_with_a_queue_handler_object(self):
+    def test_igniter_can_spawn_and_start_properly_with_a_queue_handler_object(
+        self, igniter_instance, monkeypatch
+    ):
         """
-        This function asserts the `igniter.spawn_and_start()` can be executed properly.
+        This function asserts the `igniter.spawn_and_start()` can be executed properly. The thread is joined with a
+        timeout before checking the call, so the assertion never races the thread and a stuck thread can't hang the
+        test.
         """
+        monkeypatch.setattr(
+            igniter.Igniter, 'execution_loop', mock_igniter_execution_loop
+        )
         mock_handler = mock.MagicMock(spec=queue_handler.QueueHandler)
-        test_igniter = igniter.Igniter(self.config_path)
+        mock_igniter_execution_loop.calls.clear()
 
-        try:
-            test_igniter.spawn_and_start(mock_handler)
-            mock_igniter_execution_loop.assert_called_once_with(
-                test_igniter, mock_handler
-            )
-        finally:
-            test_igniter.thread.join()
+        igniter_instance.spawn_and_start(mock_handler)
+        igniter_instance.thread.join(timeout=1)
 
-    @pytest.mark.timeout(2)
-    def test_sleep_for_can_pause_for_at_least_given_duration(self):
+        assert not igniter_instance.thread.is_alive()
+        assert mock_igniter_execution_loop.calls == [(igniter_instance, mock_handler)]
+
+    def test_sleep_for_pauses_the_thread_for_the_given_duration(
+        self, igniter_instance, monkeypatch
+    ):
         """
-        This function asserts the `igniter.sleep_for()` pauses the thread for at least a given duration.
+        This function asserts the `igniter.sleep_for()` pauses the thread for a given duration. `time.sleep()` is
+        replaced by a mock, so the test checks the duration passed to it instead of actually sleeping.
         """
-        test_igniter = igniter.Igniter(self.config_path)
+        mock_sleep = mock.Mock()
+        monkeypatch.setattr(igniter.time, 'sleep', mock_sleep)
         test_sleep_time = 1
 
-        start = timeit.default_timer()
-        test_igniter.sleep_for(test_sleep_time)
-        stop = timeit.default_timer()
-        elapsed = stop - start
+        igniter_instance.sleep_for(test_sleep_time)
 
-        assert test_sleep_time <= elapsed <= test_sleep_time * 1.5
+        mock_sleep.assert_called_once_with(test_sleep_time)
 
-    def test_igniter_join_can_handle_exception(self, caplog):
+    def test_igniter_join_can_handle_exception(self, igniter_instance, caplog):
         """
         This function asserts the `igniter.join()` handles the exception properly, meanwhile, insufficiently, this
         to some extent, tests the availability of `igniter.join()`, since it's just a wrapper around the
         `threading.Thread.join()`.
         """
-        caplog.set_level(logging.ERROR)
-        test_igniter = igniter.Igniter(self.config_path)
+        assert igniter_instance.thread is None
 
-        assert test_igniter.thread is None
+        igniter_instance.join()
 
-        test_igniter.join()
-        error = caplog.text
-
-        assert 'The thread of this igniter is not in a running state.' in error
+        assert has_log_record(
+            caplog,
+            logging.ERROR,
+            'The thread of this igniter is not in a running state.',
+        )
 
-    @patch(
-        'falcon.igniter.CromwellAPI.release_hold',
-        cromwell_simulator.release_workflow_succeed,
-        create=True,
-    )
-    def test_release_workflow_successfully_releases_a_workflow(self, caplog):
+    def test_release_workflow_successfully_releases_a_workflow(
+        self, igniter_instance, caplog, monkeypatch
+    ):
         """
         This function asserts the `igniter.release_workflow()` can work properly when it gets 200 OK from the Cromwell.
         """
-        caplog.set_level(logging.INFO)
-
-        test_igniter = igniter.Igniter(self.config_path)
-        test_igniter.release_workflow(self.mock_workflow)
-
-        info = caplog.text
-
-        assert 'Released a workflow fake_workflow_id' in info
-
-    @patch(
-        'falcon.igniter.CromwellAPI.release_hold',
-        cromwell_simulator.release_workflow_with_403,
-        create=True,
-    )
-    def test_release_workflow_handles_403_response_code(self, caplog):
-        """
-        This function asserts the `igniter.release_workflow()` can work properly when it gets 403 error from the
-        Cromwell.
-        """
-        caplog.set_level(logging.WARNING)
-
-        test_igniter = igniter.Igniter(self.config_path)
-        test_igniter.release_workflow(self.mock_workflow)
-
-        warn = caplog.text
-
-        assert 'Failed to release a workflow fake_workflow_id' in warn
-
-    @patch(
-        'falcon.igniter.CromwellAPI.release_hold',
-        cromwell_simulator.release_workflow_with_404,
-        create=True,
-    )
-    def test_release_workflow_handles_404_response_code(self, caplog):
-        """
-        This function asserts the `igniter.release_workflow()` can work properly when it gets 404 error from the
-        Cromwell.
-        """
-        caplog.set_level(logging.WARNING)
-
-        test_igniter = igniter.Igniter(self.config_path)
-        test_igniter.release_workflow(self.mock_workflow)
-
-        warn = caplog.text
-
-        assert 'Failed to release a workflow fake_workflow_id' in warn
-
-    @patch(
-        'falcon.igniter.CromwellAPI.release_hold',
-        cromwell_simulator.release_workflow_with_500,
-        create=True,
-    )
-    def test_release_workflow_handles_500_response_code(self, caplog):
-        """
-        This function asserts the `igniter.release_workflow()` can work properly when it gets 500 error from the
-        Cromwell.
-        """
-        caplog.set_level(logging.WARNING)
-
-        test_igniter = igniter.Igniter(self.config_path)
-        test_igniter.release_workflow(self.mock_workflow)
-
-        warn = caplog.text
-
-        assert 'Failed to release a workflow fake_workflow_id' in warn
-
-    @patch(
-        'falcon.igniter.CromwellAPI.release_hold',
-        cromwell_simulator.release_workflow_raises_ConnectionError,
-        create=True,
-    )
-    def test_release_workflow_handles_connection_error(self, caplog):
-        """
-        This function asserts the `igniter.release_workflow()` can work properly when it runs into connection errors
-        when talking to Cromwell.
-        """
-        caplog.set_level(logging.ERROR)
-
-        test_igniter = igniter.Igniter(self.config_path)
-        test_igniter.release_workflow(self.mock_workflow)
+        monkeypatch.setattr(
+            igniter.CromwellAPI,
+            'release_hold',
+            cromwell_simulator.release_workflow_succeed,
+        )
 
-        error = caplog.text
+        igniter_instance.release_workflow(self.mock_workflow)
 
-        assert 'Failed to release a workflow fake_workflow_id' in error
+        assert has_log_record(
+            caplog, logging.INFO, 'Released a workflow fake_workflow_id'
+        )
 
-    @patch(
-        'falcon.igniter.CromwellAPI.release_hold',
-        cromwell_simulator.release_workflow_raises_RequestException,
-        create=True,
+    @pytest.mark.parametrize(
+        'release_func, log_level',
+        [
+            (cromwell_simulator.release_workflow_with_403, logging.WARNING),
+            (cromwell_simulator.release_workflow_with_404, logging.WARNING),
+            (cromwell_simulator.release_workflow_with_500, logging.WARNING),
+            (cromwell_simulator.release_workflow_raises_ConnectionError, logging.ERROR),
+            (
+                cromwell_simulator.release_workflow_raises_RequestException,
+                logging.ERROR,
+            ),
+        ],
+        ids=['403', '404', '500', 'connection-error', 'requests-exception'],
     )
-    def test_release_workflow_handles_requests_exception(self, caplog):
+    def test_release_workflow_handles_failures_when_talking_to_cromwell(
+        self, igniter_instance, caplog, monkeypatch, release_func, log_level
+    ):
         """
-        This function asserts the `igniter.release_workflow()` can work properly when it runs into requests exceptions
-        when talking to Cromwell.
+        This function asserts the `igniter.release_workflow()` can work properly when it gets 403, 404 or 500 error
+        codes from the Cromwell, or runs into connection errors or requests exceptions when talking to Cromwell.
         """
-        caplog.set_level(logging.ERROR)
-
-        test_igniter = igniter.Igniter(self.config_path)
-        test_igniter.release_workflow(self.mock_workflow)
+        monkeypatch.setattr(igniter.CromwellAPI, 'release_hold', release_func)
 
-        error = caplog.text
+        igniter_instance.release_workflow(self.mock_workflow)
 
-        assert 'Failed to release a workflow fake_workflow_id' in error
+        assert has_log_record(
+            caplog, log_level, 'Failed to release a workflow fake_workflow_id'
+        )
 
     def setup_queue_handler(self, workflow=None):
         mock_queue = Queue(maxsize=1)
@@ -230,220 +190,149 @@ class TestIgniter(object):
         mock_handler.workflow_queue = mock_queue
         return mock_handler
 
-    def test_execution_event_sleeps_properly_for_empty_queue(self, caplog):
+    def test_execution_event_sleeps_properly_for_empty_queue(
+        self, igniter_instance, caplog, monkeypatch
+    ):
         """
         This function asserts the `igniter.execution_event()` goes back to sleep when there is no available entry in the
         queue to be processed.
         """
-        caplog.set_level(logging.INFO)
         mock_handler = self.setup_queue_handler()
         assert mock_handler.workflow_queue.empty() is True
 
-        test_igniter = igniter.Igniter(self.config_path)
-        test_igniter.workflow_start_interval = 1
+        mock_sleep = mock.Mock()
+        monkeypatch.setattr(igniter.time, 'sleep', mock_sleep)
+        monkeypatch.setattr(igniter_instance, 'workflow_start_interval', 1)
 
-        start = timeit.default_timer()
-        test_igniter.execution_event(mock_handler)
-        stop = timeit.default_timer()
-        elapsed = stop - start
+        igniter_instance.execution_event(mock_handler)
 
-        info = caplog.text
-
-        assert (
-            'The in-memory queue is empty, go back to sleep and wait for the handler to retrieve workflows.'
-            in info
-        )
-        assert (
-            test_igniter.workflow_start_interval
-            <= elapsed
-            <= test_igniter.workflow_start_interval * 1.5
+        assert has_log_record(
+            caplog,
+            logging.INFO,
+            'The in-memory queue is empty, go back to sleep and wait for the handler to retrieve workflows.',
         )
-
-    def execution_event_with_mocks(
+        mock_sleep.assert_called_once_with(igniter_instance.workflow_start_interval)
+
+    @pytest.mark.parametrize(
+        'workflow, is_dupe_return, is_dupe_effect, release_calls, abort_calls',
+        [
+            (queue_handler.Workflow('fake_workflow_id'), True, None, 0, 1),
+            (
+                queue_handler.Workflow('fake_workflow_id', labels={'force': None}),
+                True,
+                None,
+                1,
+                0,
+            ),
+            (queue_handler.Workflow('fake_workflow_id'), False, None, 1, 0),
+            (queue_handler.Workflow('fake_workflow_id'), None, ConnectionError(), 0, 0),
+            (queue_handler.Workflow('fake_workflow_id'), None, HTTPError(), 0, 0),
+        ],
+        ids=[
+            'aborts-duplicate',
+            'releases-duplicate-with-force',
+            'releases-non-duplicate',
+            'does-nothing-on-query-failure',
+            'does-nothing-when-query-status-not-200',
+        ],
+    )
+    def test_execution_event_releases_or_aborts_workflow_properly(
         self,
+        igniter_instance,
+        monkeypatch,
         workflow,
+        is_dupe_return,
+        is_dupe_effect,
         release_calls,
         abort_calls,
-        is_dupe_return=None,
-        is_dupe_effect=None,
     ):
-        mock_handler = self.setup_queue_handler(workflow=workflow)
-
-        test_igniter = igniter.Igniter(self.config_path)
-        test_igniter.workflow_is_duplicate = mock.Mock(
-            return_value=is_dupe_return, side_effect=is_dupe_effect
-        )
-        test_igniter.release_workflow = mock.Mock()
-        test_igniter.abort_workflow = mock.Mock()
-
-        test_igniter.execution_event(mock_handler)
-        assert test_igniter.release_workflow.call_count is release_calls
-        assert test_igniter.abort_workflow.call_count is abort_calls
-
-    def test_execution_event_aborts_duplicate_workflow(self, caplog):
-        """
-        This function asserts the `igniter.execution_event()` aborts a workflow if there
-        are existing workflows in cromwell with the same hash-id  (regardless of status).
-        """
-        caplog.set_level(logging.INFO)
-        self.execution_event_with_mocks(
-            workflow=queue_handler.Workflow('fake_workflow_id'),
-            release_calls=0,
-            abort_calls=1,
-            is_dupe_return=True,
-        )
-
-    def test_execution_event_releases_duplicate_workflow_with_force(self, caplog):
-        """
-        This function asserts the `igniter.execution_event()` releases a workflow if it contains
-        the label 'force' even if there are existing workflows in cromwell with the same
-        key-data hash.
-        """
-        caplog.set_level(logging.INFO)
-        self.execution_event_with_mocks(
-            workflow=queue_handler.Workflow('fake_workflow_id', labels={'force': None}),
-            release_calls=1,
-            abort_calls=0,
-            is_dupe_return=True,
-        )
-
-    def test_execution_event_releases_non_duplicate_workflow(self, caplog):
-        """
-        This function asserts the `igniter.execution_event()` releases a workflow if there
-        are no existing workflows in cromwell with the same hash-id.
-        """
-        caplog.set_level(logging.INFO)
-        self.execution_event_with_mocks(
-            workflow=queue_handler.Workflow('fake_workflow_id'),
-            release_calls=1,
-            abort_calls=0,
-            is_dupe_return=False,
-        )
-
-    def test_execution_event_does_nothing_on_query_failure(self, caplog):
-        """
-        This function asserts the `igniter.execution_event()` goes back to sleep when it fails when
-        checking if there are existing workflows in cromwell with the same hash-id.
-        """
-        caplog.set_level(logging.INFO)
-        self.execution_event_with_mocks(
-            workflow=queue_handler.Workflow('fake_workflow_id'),
-            release_calls=0,
-            abort_calls=0,
-            is_dupe_effect=mock.Mock(side_effect=ConnectionError()),
-        )
-
-    def test_execution_event_does_nothing_when_query_status_not_200(self, caplog):
         """
-        This function assers the `igniter.execution_event()` goes back to sleep when it
-        receives a non 200 response when checking if there are existing workflows in cromwell
-        with the same hash-id
+        This function asserts the `igniter.execution_event()`:
+            - aborts a workflow if there are existing workflows in cromwell with the same hash-id (regardless of status)
+            - releases a workflow if it contains the label 'force' even if there are existing workflows in cromwell
+            with the same key-data hash
+            - releases a workflow if there are no existing workflows in cromwell with the same hash-id
+            - goes back to sleep when it fails, or receives a non 200 response, when checking if there are existing
+            workflows in cromwell with the same hash-id
+        In every case it sleeps for `workflow_start_interval` afterwards, `time.sleep()` is replaced by a mock so the
+        test doesn't actually wait.
         """
-        caplog.set_level(logging.INFO)
-        self.execution_event_with_mocks(
-            workflow=queue_handler.Workflow('fake_workflow_id'),
-            release_calls=0,
-            abort_calls=0,
-            is_dupe_effect=mock.Mock(side_effect=HTTPError()),
-        )
+        mock_handler = self.setup_queue_handler(workflow=workflow)
+        mock_sleep = mock.Mock()
+        monkeypatch.setattr(igniter.time, 'sleep', mock_sleep)
 
-    @patch(
-        'falcon.igniter.CromwellAPI.query',
-        cromwell_simulator.query_workflows_succeed,
-        create=True,
-    )
-    def test_workflow_is_duplicate_returns_true_when_it_finds_workflow_with_same_hash_id(
-        self, caplog
-    ):
-        caplog.set_level(logging.INFO)
-        test_igniter = igniter.Igniter(self.config_path)
-        assert (
-            test_igniter.workflow_is_duplicate(
-                workflow=queue_handler.Workflow(
-                    'fake_workflow_id', labels={'hash-id': ''}
-                )
-            )
-            is True
+        monkeypatch.setattr(
+            igniter.Igniter,
+            'workflow_is_duplicate',
+            mock.Mock(return_value=is_dupe_return, side_effect=is_dupe_effect),
         )
-
-    @patch(
-        'falcon.igniter.CromwellAPI.query',
-        cromwell_simulator.query_workflows_return_fake_workflow,
-        create=True,
-    )
-    def test_workflow_is_duplicate_returns_false_when_it_only_finds_input_workflow(
-        self, caplog
-    ):
-        caplog.set_level(logging.INFO)
-        test_igniter = igniter.Igniter(self.config_path)
-        assert (
-            test_igniter.workflow_is_duplicate(
-                workflow=queue_handler.Workflow(
-                    'fake_workflow_id', labels={'hash-id': ''}
-                )
-            )
-            is False
-        )
-
-    @patch(
-        'falcon.igniter.CromwellAPI.query',
-        cromwell_simulator.query_workflows_returns_on_hold_workflows_with_duplicate_bundle_versions,
-        create=True,
-    )
-    def test_workflow_is_duplicate_handles_duplicate_bundle_version_in_queue(
-        self, caplog
-    ):
-        caplog.set_level(logging.INFO)
-        test_igniter = igniter.Igniter(self.config_path)
-        assert (
-            test_igniter.workflow_is_duplicate(
-                workflow=queue_handler.Workflow(
+        mock_release_workflow = mock.Mock()
+        monkeypatch.setattr(igniter.Igniter, 'release_workflow', mock_release_workflow)
+        mock_abort_workflow = mock.Mock()
+        monkeypatch.setattr(igniter.Igniter, 'abort_workflow', mock_abort_workflow)
+
+        igniter_instance.execution_event(mock_handler)
+        assert mock_release_workflow.call_count == release_calls
+        assert mock_abort_workflow.call_count == abort_calls
+        mock_sleep.assert_called_once_with(igniter_instance.workflow_start_interval)
+
+    @pytest.mark.parametrize(
+        'query_func, workflow, expected',
+        [
+            (
+                cromwell_simulator.query_workflows_succeed,
+                queue_handler.Workflow('fake_workflow_id', labels={'hash-id': ''}),
+                True,
+            ),
+            (
+                cromwell_simulator.query_workflows_return_fake_workflow,
+                queue_handler.Workflow('fake_workflow_id', labels={'hash-id': ''}),
+                False,
+            ),
+            (
+                cromwell_simulator.query_workflows_returns_on_hold_workflows_with_duplicate_bundle_versions,
+                queue_handler.Workflow(
                     'fake_workflow_id_1',
                     bundle_version='2019-08-22T120000.000000Z',
                     labels={'hash-id': '12345'},
-                )
-            )
-            is False
-        )
-
-    @patch(
-        'falcon.igniter.CromwellAPI.query',
-        cromwell_simulator.query_workflows_returns_workflows_with_different_bundle_versions,
-        create=True,
-    )
-    def test_workflow_is_duplicate_returns_true_if_newer_bundle_version_is_on_hold(
-        self, caplog
-    ):
-        caplog.set_level(logging.INFO)
-        test_igniter = igniter.Igniter(self.config_path)
-        assert (
-            test_igniter.workflow_is_duplicate(
-                workflow=queue_handler.Workflow(
+                ),
+                False,
+            ),
+            (
+                cromwell_simulator.query_workflows_returns_workflows_with_different_bundle_versions,
+                queue_handler.Workflow(
                     'fake_workflow_id_1',
                     bundle_version='2019-08-22T120000.000000Z',
                     labels={'hash-id': '12345'},
-                )
-            )
-            is True
-        )
-
-    @patch(
-        'falcon.igniter.CromwellAPI.query',
-        cromwell_simulator.query_workflows_returns_workflows_with_different_bundle_versions,
-        create=True,
-    )
-    def test_workflow_is_duplicate_returns_false_if_bundle_is_the_latest_version_on_hold(
-        self, caplog
-    ):
-        caplog.set_level(logging.INFO)
-        test_igniter = igniter.Igniter(self.config_path)
-        assert (
-            test_igniter.workflow_is_duplicate(
-                workflow=queue_handler.Workflow(
+                ),
+                True,
+            ),
+            (
+                cromwell_simulator.query_workflows_returns_workflows_with_different_bundle_versions,
+                queue_handler.Workflow(
                     'fake_workflow_id_2',
                     bundle_version='2019-08-22T130000.000000Z',
                     labels={'hash-id': '12345'},
-                )
-            )
-            is False
-        )
+                ),
+                False,
+            ),
+        ],
+        ids=[
+            'finds-workflow-with-same-hash-id',
+            'only-finds-input-workflow',
+            'duplicate-bundle-version-in-queue',
+            'newer-bundle-version-is-on-hold',
+            'bundle-is-the-latest-version-on-hold',
+        ],
+    )
+    def test_workflow_is_duplicate_checks_existing_workflows_properly(
+        self, igniter_instance, monkeypatch, query_func, workflow, expected
+    ):
+        """
+        This function asserts the `igniter.workflow_is_duplicate()` reports a workflow as a duplicate when Cromwell has
+        other workflows with the same hash-id, unless some of them are on hold and the workflow has the newest bundle
+        version among them.
+        """
+        monkeypatch.setattr(igniter.CromwellAPI, 'query', query_func)
+
+        assert igniter_instance.workflow_is_duplicate(workflow=workflow) is expected
@@ -6,55 +6,130 @@ import pytest
 from falcon import settings
 
 
+@pytest.fixture(scope='class')
+def expected_settings_dic_cromwell_instance(request):
+    """
+    The raw content of the Cromwell instance config, read once per class on first use instead of at collection time.
+    """
+    with open(request.cls.cromwell_path) as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope='class')
+def expected_settings_dic_caas(request):
+    """
+    The raw content of the CaaS config, read once per class on first use instead of at collection time.
+    """
+    with open(request.cls.caas_path) as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope='class')
+def cromwell_instance_settings(request):
+    """
+    The settings loaded from the Cromwell instance config, shared by all tests in a class that only read them.
+    """
+    return settings.get_settings(request.cls.cromwell_path)
+
+
 class TestSettings(object):
-    data_dir = '{}/data/'.format(os.path.split(__file__)[0])
+    data_dir = os.path.join(os.path.dirname(__file__), 'data')
     cromwell_config = 'example_config_cromwell_instance.json'
     caas_config = 'example_config_caas.json'
-
-    with open('{0}{1}'.format(data_dir, cromwell_config)) as f:
-        expected_settings_dic_cromwell_instance = json.load(f)
-    with open('{0}{1}'.format(data_dir, caas_config)) as f:
-        expected_settings_dic_caas = json.load(f)
+    cromwell_path = os.path.join(data_dir, cromwell_config)
+    caas_path = os.path.join(data_dir, caas_config)
 
     def test_get_settings_loads_config_file_for_cromwell_instance_without_exceptions(
         self
     ):
-        settings.get_settings('{0}{1}'.format(self.data_dir, self.cromwell_config))
+        settings.get_settings(self.cromwell_path)
 
-    def test_get_settings_loads_config_file_for_cromwell_instance_correctly(self):
-        loaded_settings = settings.get_settings(
-            '{0}{1}'.format(self.data_dir, self.cromwell_config)
-        )
+    def test_get_settings_loads_config_file_for_cromwell_instance_correctly(
+        self, cromwell_instance_settings, expected_settings_dic_cromwell_instance
+    ):
+        loaded_settings = cromwell_instance_settings
         assert loaded_settings[
             'cromwell_url'
-        ] == self.expected_settings_dic_cromwell_instance.get('cromwell_url')
+        ] == expected_settings_dic_cromwell_instance.get('cromwell_url')
         assert loaded_settings[
             'use_caas'
-        ] == self.expected_settings_dic_cromwell_instance.get('use_caas')
+        ] == expected_settings_dic_cromwell_instance.get('use_caas')
         assert loaded_settings[
             'cromwell_user'
-        ] == self.expected_settings_dic_cromwell_instance.get('cromwell_user')
+        ] == expected_settings_dic_cromwell_instance.get('cromwell_user')
         assert loaded_settings[
             'cromwell_password'
-        ] == self.expected_settings_dic_cromwell_instance.get('cromwell_password')
+        ] == expected_settings_dic_cromwell_instance.get('cromwell_password')
         assert loaded_settings['queue_update_interval'] == int(
-            self.expected_settings_dic_cromwell_instance.get('queue_update_interval')
+            expected_settings_dic_cromwell_instance.get('queue_update_interval')
         )
         assert loaded_settings['workflow_start_interval'] == int(
-            self.expected_settings_dic_cromwell_instance.get('workflow_start_interval')
+            expected_settings_dic_cromwell_instance.get('workflow_start_interval')
         )
 
-    def test_get_settings_cromwell_query_dict_includes_on_hold_status(self):
-        loaded_settings = settings.get_settings(
-            '{0}{1}'.format(self.data_dir, self.cromwell_config)
+    @pytest.mark.parametrize(
+        'new_interval, new_mtime_ns',
+        [(42, 1), (42, 0), ('11', 1)],
+        ids=['size-and-mtime-change', 'only-size-changes', 'only-mtime-changes'],
+    )
+    def test_get_settings_reloads_config_file_after_it_changes(
+        self,
+        tmpdir,
+        expected_settings_dic_cromwell_instance,
+        new_interval,
+        new_mtime_ns,
+    ):
+        config_file = tmpdir.join(self.cromwell_config)
+        config = dict(
+            expected_settings_dic_cromwell_instance, workflow_start_interval='10'
         )
-        assert loaded_settings['cromwell_query_dict']['status'] == 'On Hold'
+        config_file.write(json.dumps(config))
+        os.utime(str(config_file), ns=(0, 0))
+        assert settings.get_settings(str(config_file))['workflow_start_interval'] == 10
+
+        config['workflow_start_interval'] = new_interval
+        config_file.write(json.dumps(config))
+        os.utime(str(config_file), ns=(new_mtime_ns, new_mtime_ns))
+        assert settings.get_settings(str(config_file))[
+            'workflow_start_interval'
+        ] == int(new_interval)
+
+    def test_get_settings_cromwell_query_dict_includes_on_hold_status(
+        self, cromwell_instance_settings
+    ):
+        assert cromwell_instance_settings['cromwell_query_dict']['status'] == 'On Hold'
+
+    def test_get_settings_shares_the_cache_between_spellings_of_the_same_path(self):
+        settings.get_settings(self.cromwell_path)
+        hits = settings._load_config.cache_info().hits
+
+        settings.get_settings(
+            os.path.join(self.data_dir, '..', 'data', '.', self.cromwell_config)
+        )
+        assert settings._load_config.cache_info().hits == hits + 1
+
+    def test_get_settings_returns_a_query_dict_that_is_safe_to_mutate(
+        self, tmpdir, expected_settings_dic_cromwell_instance
+    ):
+        config_file = tmpdir.join(self.cromwell_config)
+        config = dict(expected_settings_dic_cromwell_instance)
+        config['cromwell_query_dict'] = {'label': 'project:fake'}
+        config_file.write(json.dumps(config))
+
+        loaded_settings = settings.get_settings(str(config_file))
+        loaded_settings['cromwell_query_dict']['additionalQueryResultFields'] = 'labels'
+
+        reloaded_settings = settings.get_settings(str(config_file))
+        assert reloaded_settings['cromwell_query_dict'] == {
+            'label': 'project:fake',
+            'status': 'On Hold',
+        }
 
     def test_get_settings_loads_config_file_for_caas_throw_exceptions_without_caas_key(
         self
     ):
         with pytest.raises(ValueError):
-            settings.get_settings('{0}{1}'.format(self.data_dir, self.caas_config))
+            settings.get_settings(self.caas_path)
 
     def test_get_settings_loads_config_file_for_caas_for_capital_env_variable_correctly(
         self, monkeypatch
@@ -64,39 +139,37 @@ class TestSettings(object):
                 'CAAS_KEY', 'encrypted_key_content_string_to_communicate_with_caas'
             )
 
-            loaded_settings = settings.get_settings(
-                '{0}{1}'.format(self.data_dir, self.caas_config)
-            )
+            loaded_settings = settings.get_settings(self.caas_path)
             assert (
                 loaded_settings['caas_key']
                 == 'encrypted_key_content_string_to_communicate_with_caas'
             )
 
-    def test_get_settings_loads_config_file_for_caas_correctly(self, monkeypatch):
+    def test_get_settings_loads_config_file_for_caas_correctly(
+        self, monkeypatch, expected_settings_dic_caas
+    ):
         with monkeypatch.context() as ctx:
             ctx.setenv(
                 'caas_key', 'encrypted_key_content_string_to_communicate_with_caas'
             )
 
-            loaded_settings = settings.get_settings(
-                '{0}{1}'.format(self.data_dir, self.caas_config)
-            )
-            assert loaded_settings[
+            loaded_settings = settings.get_settings(self.caas_path)
+            assert loaded_settings['cromwell_url'] == expected_settings_dic_caas.get(
                 'cromwell_url'
-            ] == self.expected_settings_dic_caas.get('cromwell_url')
-            assert loaded_settings['use_caas'] == self.expected_settings_dic_caas.get(
+            )
+            assert loaded_settings['use_caas'] == expected_settings_dic_caas.get(
                 'use_caas'
             )
             assert (
                 loaded_settings['caas_key']
                 == 'encrypted_key_content_string_to_communicate_with_caas'
             )
-            assert loaded_settings[
+            assert loaded_settings['collection_name'] == expected_settings_dic_caas.get(
                 'collection_name'
-            ] == self.expected_settings_dic_caas.get('collection_name')
+            )
             assert loaded_settings['queue_update_interval'] == int(
-                self.expected_settings_dic_caas.get('queue_update_interval')
+                expected_settings_dic_caas.get('queue_update_interval')
             )
             assert loaded_settings['workflow_start_interval'] == int(
-                self.expected_settings_dic_caas.get('workflow_start_interval')
+                expected_settings_dic_caas.get('workflow_start_interval')
             )